@@ -16,6 +16,7 @@ TARGET_DDS_TABLE_SATELLITE_LETTERS = 's_letters'
 TARGET_DDS_TABLE_LINK_POSTS = 'l_posts'
 TARGET_DDS_SCHEMA_NAME = 'dds'
 TIMEOUT = 60
+POOL_TIMEOUT = 5
 
 host_name = os.getenv(OS_DB_CREDENTIAL_HOST) or 'localhost' 
 port = os.getenv(OS_DB_CREDENTIAL_PORT) or '5439'
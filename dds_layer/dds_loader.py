@@ -3,34 +3,30 @@ Module consists of DDSLoader class for interacting
 with stg and dds data levels (for loading data from stg to dds.)
 """
 
-import asyncio
-import hashlib
-import logging
-from io import StringIO
 from typing import Optional
 
+import numpy as np
 import pandas as pd
 import psycopg
-from psycopg.rows import dict_row
 
-from config import CONN_STR
-from utils.decorators import with_connection
+from utils.decorators import with_async_connection, with_connection
+from utils.hashing import md5_hex_column
+from utils.logging_setup import get_logger
 
-logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
-h = logging.StreamHandler()
-h.setLevel(logging.DEBUG)
-f = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
-h.setFormatter(f)
-if not logger.hasHandlers():
-    logger.addHandler(h)
+logger = get_logger(__name__)
 
 
 class DDSLoader:
     """Used for loading raw data from STG to DDS.
     Data model: Data Vault 2.0.
+
+    Attrs:
+        STG_COLUMNS (list[str]): columns downloaded from the stg table.
     """
 
+    STG_COLUMNS: list[str] = ["user_id", "id", "title", "body"]
+    _copy_sql: dict[tuple[str, tuple[str, ...]], str] = {}
+
     def __init__(
         self,
         table_h_users: str,
@@ -58,18 +54,18 @@ class DDSLoader:
     @with_connection
     def download_stg_data(
         self, conn: Optional[psycopg.Connection] = None
-    ) -> list[dict]:
+    ) -> list[tuple]:
         """Downloads raw data from the stg level.
 
         Args:
             conn (psycopg.Connection, optional): db connection. Defaults to None.
 
         Returns:
-            list[dict]: a list of dicts representing rows from the table.
+            list[tuple]: a list of tuples representing rows from the table.
         """
 
         logger.debug(f"Downloading data from raw_test_data table...")
-        with conn.cursor(row_factory=dict_row) as cursor:
+        with conn.cursor() as cursor:
             cursor.execute(
                 """
                     SELECT 
@@ -84,19 +80,19 @@ class DDSLoader:
             data = cursor.fetchall()
         return data
 
-    @staticmethod
-    def transform_data_to_df(data: list[dict]) -> pd.DataFrame:
-        """Transforms list of dicts into dataframe.
+    @classmethod
+    def transform_data_to_df(cls, data: list[tuple]) -> pd.DataFrame:
+        """Transforms list of row tuples into dataframe.
 
         Args:
-            data (list[dict]): list representing table.
+            data (list[tuple]): list representing table, rows ordered as STG_COLUMNS.
 
         Returns:
             pd.DataFrame: pandas df format.
         """
 
         logger.debug(f"Transforming data to df...")
-        df = pd.DataFrame.from_dict(data)
+        df = pd.DataFrame(data, columns=cls.STG_COLUMNS)
         return df
 
     @staticmethod
@@ -111,117 +107,143 @@ class DDSLoader:
         """
 
         logger.debug(f"Adding hashes: user_id_hash, letter_id_hash to df...")
-        df["user_id_hash"] = df["user_id"].apply(
-            lambda x: hashlib.md5(str(x).encode()).hexdigest()
-        )
-        df["letter_id_hash"] = df["id"].apply(
-            lambda x: hashlib.md5(str(x).encode()).hexdigest()
-        )
+        df["user_id_hash"] = md5_hex_column(df["user_id"])
+        df["letter_id_hash"] = md5_hex_column(df["id"])
         return df
 
     @staticmethod
-    def split_df_to_tables(df: pd.DataFrame) -> tuple[pd.DataFrame]:
+    def split_df_to_tables(df: pd.DataFrame) -> tuple[dict[str, np.ndarray]]:
         """Splits common dataframe into target dds tables.
 
+        Tables are returned as mappings of target column name to the
+        underlying numpy array of df, so no intermediate dataframes are built.
+
         Args:
             df (pd.DataFrame): updated version of data.
 
         Returns:
-            tuple[pd.DataFrame]: a tuple with target dataframes to be uploaded.
+            tuple[dict[str, np.ndarray]]: a tuple with target tables to be uploaded.
         """
 
-        logger.debug(f"Splitting common df to target dataframes...")
-        df_users_hub = df[["user_id", "user_id_hash"]]
-        df_users_hub = df_users_hub.drop_duplicates()
-        df_letters_hub = df[["id", "letter_id_hash"]]
-        df_letters_hub = df_letters_hub.rename(columns={"id": "letter_id"})
-        df_letters_satellite = df[["letter_id_hash", "title", "body"]]
-        df_posts_link = df[["user_id_hash", "letter_id_hash"]]
-        return df_users_hub, df_letters_hub, df_letters_satellite, df_posts_link
+        logger.debug(f"Splitting common df to target tables...")
+        user_id = df["user_id"].to_numpy()
+        user_id_hash = df["user_id_hash"].to_numpy()
+        letter_id_hash = df["letter_id_hash"].to_numpy()
+        is_first_user = ~df["user_id"].duplicated().to_numpy()
+        users_hub = {
+            "user_id": user_id[is_first_user],
+            "user_id_hash": user_id_hash[is_first_user],
+        }
+        letters_hub = {
+            "letter_id": df["id"].to_numpy(),
+            "letter_id_hash": letter_id_hash,
+        }
+        letters_satellite = {
+            "letter_id_hash": letter_id_hash,
+            "letter_title": df["title"].to_numpy(),
+            "letter_body": df["body"].to_numpy(),
+        }
+        posts_link = {
+            "user_id_hash": user_id_hash,
+            "letter_id_hash": letter_id_hash,
+        }
+        return users_hub, letters_hub, letters_satellite, posts_link
+
+    @classmethod
+    def get_copy_sql(cls, table_path: str, columns: tuple[str, ...]) -> str:
+        """Returns binary COPY statement for the table, built once per process.
+
+        Args:
+            table_path (str): target table name, optionally schema-qualified.
+            columns (tuple[str, ...]): columns to be uploaded.
+
+        Returns:
+            str: COPY FROM STDIN statement.
+        """
+
+        key = (table_path, columns)
+        if key not in cls._copy_sql:
+            columns_clause = ",".join(f'"{c}"' for c in columns)
+            cls._copy_sql[key] = (
+                f"COPY {table_path} ({columns_clause}) FROM STDIN WITH (FORMAT BINARY)"
+            )
+        return cls._copy_sql[key]
 
-    @staticmethod
     async def upload_dds_table(
-        df: pd.DataFrame,
+        self,
+        aconn: psycopg.AsyncConnection,
+        table: dict[str, np.ndarray],
         table_name: str,
-        columns: Optional[list[str]] = None,
+        types: list[str],
         schema: Optional[str] = None,
-        index: bool = False,
-        block_size: int = 65_536,
     ) -> None:
-        """Asynchronously uploads data into target table using copy_from method.
+        """Asynchronously uploads data into target table using binary copy.
+
+        The copy runs in its own transaction, so a failed table does not
+        roll back the tables already loaded through the same connection.
 
         Args:
-            df (pd.DataFrame): df to be uploaded.
+            aconn (psycopg.AsyncConnection): opened db connection.
+            table (dict[str, np.ndarray]): column name to column values mapping.
             table_name (str): target table name.
-            columns (Optional[list[str]], optional): columns to be uploaded. Defaults to None.
+            types (list[str]): postgres types of the uploaded columns (e.g. 'int4', 'text').
             schema (Optional[str], optional): target schema name. Defaults to None.
-            index (bool, optional): write row names (indexes) or not. Defaults to False.
-            block_size (int, optional): optional copy block size. Defaults to 65_536.
         """
 
         try:
-            aconn = await psycopg.AsyncConnection.connect(CONN_STR)
-            async with aconn:
+            async with aconn.transaction():
                 async with aconn.cursor() as cur:
-                    buffer = StringIO()
-                    df.to_csv(buffer, index=index, header=False, na_rep=r"\N")
-                    buffer.seek(0)
                     table_path = f"{schema}.{table_name}" if schema else table_name
-                    columns_clause = ",".join(
-                        (f'"{c}"' for c in (columns or df.columns))
-                    )
-                    logger.debug(f"Uploading df into table: {schema}.{table_name}...")
-                    async with cur.copy(
-                        f"""
-                        COPY {table_path} ({columns_clause})
-                        FROM STDIN WITH (FORMAT CSV, NULL '\\N')
-                    """
-                    ) as copy:
-                        while data := buffer.read(block_size):
-                            await copy.write(data)
+                    logger.debug(f"Uploading data into table: {schema}.{table_name}...")
+                    copy_sql = self.get_copy_sql(table_path, tuple(table))
+                    async with cur.copy(copy_sql) as copy:
+                        copy.set_types(types)
+                        for row in zip(*table.values()):
+                            await copy.write_row(row)
         except psycopg.errors.UniqueViolation as e:
             logger.error(f"Data you are trying to load is already exists: {str(e)}")
 
+    @with_async_connection
     async def upload_dds_data(
         self,
-        df_users_hub: pd.DataFrame,
-        df_letters_hub: pd.DataFrame,
-        df_letters_satellite: pd.DataFrame,
-        df_posts_link: pd.DataFrame,
+        users_hub: dict[str, np.ndarray],
+        letters_hub: dict[str, np.ndarray],
+        letters_satellite: dict[str, np.ndarray],
+        posts_link: dict[str, np.ndarray],
+        aconn: Optional[psycopg.AsyncConnection] = None,
     ) -> None:
         """The main method for uploading all dds data.
 
+        All tables are copied one after another over a single connection.
+        Every upload is attempted even if an earlier one fails; the first
+        error is raised afterwards.
+
         Args:
-            df_users_hub (pd.DataFrame): dataframe of table-hub 'users'.
-            df_letters_hub (pd.DataFrame): dataframe of table-hub 'letters'.
-            df_letters_satellite (pd.DataFrame): dataframe of table-satellite 'letters'.
-            df_posts_link (pd.DataFrame): dataframe of table-link 'posts'.
+            users_hub (dict[str, np.ndarray]): columns of table-hub 'users'.
+            letters_hub (dict[str, np.ndarray]): columns of table-hub 'letters'.
+            letters_satellite (dict[str, np.ndarray]): columns of table-satellite 'letters'.
+            posts_link (dict[str, np.ndarray]): columns of table-link 'posts'.
+            aconn (Optional[psycopg.AsyncConnection], optional): db connection. Defaults to None.
         """
 
-        task_users_hub = asyncio.create_task(
-            self.upload_dds_table(
-                df=df_users_hub, table_name=self.table_h_users, schema=self.schema
-            )
-        )
-        task_letters_hub = asyncio.create_task(
-            self.upload_dds_table(
-                df=df_letters_hub, table_name=self.table_h_letters, schema=self.schema
-            )
-        )
-        task_letters_satellilte = asyncio.create_task(
-            self.upload_dds_table(
-                df=df_letters_satellite,
-                table_name=self.table_s_letters,
-                schema=self.schema,
-            )
-        )
-        task_posts_link = asyncio.create_task(
-            self.upload_dds_table(
-                df=df_posts_link, table_name=self.table_l_posts, schema=self.schema
-            )
-        )
-
-        await task_users_hub
-        await task_letters_hub
-        await task_letters_satellilte
-        await task_posts_link
+        uploads = [
+            (users_hub, self.table_h_users, ["int4", "text"]),
+            (letters_hub, self.table_h_letters, ["int4", "text"]),
+            (letters_satellite, self.table_s_letters, ["text", "text", "text"]),
+            (posts_link, self.table_l_posts, ["text", "text"]),
+        ]
+        errors = []
+        for table, table_name, types in uploads:
+            try:
+                await self.upload_dds_table(
+                    aconn,
+                    table=table,
+                    table_name=table_name,
+                    types=types,
+                    schema=self.schema,
+                )
+            except Exception as e:
+                logger.error(f"Failed to upload dds table {table_name}: {e!r}")
+                errors.append(e)
+        if errors:
+            raise errors[0]
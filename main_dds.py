@@ -1,5 +1,4 @@
 import asyncio
-import logging
 
 from config import (
     TARGET_DDS_SCHEMA_NAME,
@@ -9,15 +8,18 @@ from config import (
     TARGET_DDS_TABLE_SATELLITE_LETTERS,
 )
 from dds_layer.dds_loader import DDSLoader
+from utils.decorators import async_pool
+from utils.logging_setup import get_logger
+
+logger = get_logger(__name__)
+
+
+async def upload_and_close_pool(async_upload) -> None:
+    try:
+        await async_upload
+    finally:
+        await async_pool.close()
 
-logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
-h = logging.StreamHandler()
-h.setLevel(logging.DEBUG)
-f = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
-h.setFormatter(f)
-if not logger.hasHandlers():
-    logger.addHandler(h)
 
 if __name__ == "__main__":
     asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
@@ -32,10 +34,10 @@ if __name__ == "__main__":
     data = dss_loader.download_stg_data()
     df = dss_loader.transform_data_to_df(data)
     df = dss_loader.add_hashes_to_raw_data(df)
-    df_users_hub, df_letters_hub, df_letters_satellite, df_posts_link = (
+    users_hub, letters_hub, letters_satellite, posts_link = (
         dss_loader.split_df_to_tables(df)
     )
     async_upload = dss_loader.upload_dds_data(
-        df_users_hub, df_letters_hub, df_letters_satellite, df_posts_link
+        users_hub, letters_hub, letters_satellite, posts_link
     )
-    asyncio.run(async_upload)
+    asyncio.run(upload_and_close_pool(async_upload))
@@ -1,16 +1,8 @@
-import logging
-
 from config import TARGET_STG_SCHEMA_NAME, TARGET_STG_TABLE_NAME, TARGET_URL
 from stg_layer.stg_loader import STGLoader
+from utils.logging_setup import get_logger
 
-logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
-h = logging.StreamHandler()
-h.setLevel(logging.DEBUG)
-f = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
-h.setFormatter(f)
-if not logger.hasHandlers():
-    logger.addHandler(h)
+logger = get_logger(__name__)
 
 if __name__ == "__main__":
     logger.debug("Started loading stg data...")
@@ -3,8 +3,6 @@ Module consists of STGLoader class for uploading raw data to
 stg data level.
 """
 
-import logging
-from io import StringIO
 from typing import Optional
 
 import pandas as pd
@@ -13,15 +11,9 @@ import requests
 
 from config import TIMEOUT
 from utils.decorators import with_connection
+from utils.logging_setup import get_logger
 
-logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
-h = logging.StreamHandler()
-h.setLevel(logging.DEBUG)
-f = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
-h.setFormatter(f)
-if not logger.hasHandlers():
-    logger.addHandler(h)
+logger = get_logger(__name__)
 
 
 class STGLoader:
@@ -30,9 +22,13 @@ class STGLoader:
 
     Attrs:
         TIMEOUT (int): a default timeout for a requests.
+        STG_COLUMNS (list[str]): columns uploaded to the stg table.
+        STG_TYPES (list[str]): postgres types of STG_COLUMNS, matched by position.
     """
 
     TIMEOUT: int = TIMEOUT
+    STG_COLUMNS: list[str] = ["user_id", "id", "title", "body"]
+    STG_TYPES: list[str] = ["int4", "int4", "text", "text"]
 
     def __init__(self, url: str, table_name: str, schema: str):
         """Inits the STGLoader class instance.
@@ -46,6 +42,7 @@ class STGLoader:
         self.url = url
         self.table_name = table_name
         self.schema = schema
+        self._session = requests.Session()
 
     def download_data(self) -> list[dict]:
         """Downloads data from the target url.
@@ -55,7 +52,7 @@ class STGLoader:
         """
 
         logger.debug(f"Downloading data from: {self.url}")
-        response = requests.get(self.url, timeout=self.TIMEOUT)
+        response = self._session.get(self.url, timeout=self.TIMEOUT)
         if response.ok:
             result = response.json()
             logger.debug(f"Downloaded len: {len(result)}")
@@ -75,8 +72,8 @@ class STGLoader:
         """
 
         logger.debug(f"Transforming data from dict to df...")
-        df = pd.DataFrame.from_dict(data)
-        df = df.rename(columns={"userId": "user_id"})
+        df = pd.DataFrame(data)
+        df.rename(columns={"userId": "user_id"}, inplace=True)
         return df
 
     @with_connection
@@ -94,7 +91,12 @@ class STGLoader:
         try:
             with conn.cursor() as cursor:
                 self.copy_df(
-                    df=df, cursor=cursor, table_name=self.table_name, schema=self.schema
+                    df=df,
+                    cursor=cursor,
+                    table_name=self.table_name,
+                    types=self.STG_TYPES,
+                    columns=self.STG_COLUMNS,
+                    schema=self.schema,
                 )
         except pg.errors.UniqueViolation as e:
             logger.error(f"Data you are trying to load is already exists: {str(e)}")
@@ -104,33 +106,33 @@ class STGLoader:
         df: pd.DataFrame,
         cursor: pg.Cursor,
         table_name: str,
+        types: list[str],
         columns: Optional[list[str]] = None,
         schema: Optional[str] = None,
-        index: bool = False,
-        block_size: int = 65_536,
     ) -> None:
-        """Copy DataFrame into the database table using copy_from method.
+        """Copy DataFrame into the database table using binary copy.
+
+        Binary copy matches values to types by position, so rows are taken
+        from df in the order of columns, not in df's own column order.
 
         Args:
             df (pd.DataFrame): df to be uploaded.
             cursor (pg.Cursor): connection cursor for interacting with db.
             table_name (str): target table name.
+            types (list[str]): postgres types of the uploaded columns (e.g. 'int4', 'text').
             columns (Optional[list[str]], optional): columns to be uploaded. Defaults to None.
             schema (Optional[str], optional): target schema. Defaults to None.
-            index (bool, optional): write row names (indexes) or not. Defaults to False.
-            block_size (int, optional): optional copy block size. Defaults to 65_536.
         """
 
-        buffer = StringIO()
-        df.to_csv(buffer, index=index, header=False, na_rep=r"\N")
-        buffer.seek(0)
+        columns = columns or list(df.columns)
         table_path = f"{schema}.{table_name}" if schema else table_name
-        columns_clause = ",".join((f'"{c}"' for c in (columns or df.columns)))
+        columns_clause = ",".join((f'"{c}"' for c in columns))
         with cursor.copy(
             f"""
             COPY {table_path} ({columns_clause})
-            FROM STDIN WITH (FORMAT CSV, NULL '\\N')
+            FROM STDIN WITH (FORMAT BINARY)
         """
         ) as copy:
-            while data := buffer.read(block_size):
-                copy.write(data)
+            copy.set_types(types)
+            for row in df[columns].itertuples(index=False, name=None):
+                copy.write_row(row)
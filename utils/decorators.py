@@ -1,21 +1,30 @@
-import psycopg
+import atexit
 
-from config import CONN_STR
+from psycopg_pool import AsyncConnectionPool, ConnectionPool
+
+from config import CONN_STR, POOL_TIMEOUT
+
+pool = ConnectionPool(CONN_STR, min_size=1, max_size=8, open=False)
+async_pool = AsyncConnectionPool(CONN_STR, min_size=1, max_size=8, open=False)
+atexit.register(pool.close)
 
 
 def with_connection(f):
     def with_connection_(*args, **kwargs):
-        conn = psycopg.connect(CONN_STR)
-        try:
-            rv = f(*args, **kwargs, conn=conn)
-        except Exception:
-            conn.rollback()
-            raise
-        else:
-            conn.commit()
-        finally:
-            conn.close()
-
-        return rv
+        if pool.closed:
+            # fail fast if the db is unreachable instead of retrying in background
+            pool.open(wait=True, timeout=POOL_TIMEOUT)
+        with pool.connection(timeout=POOL_TIMEOUT) as conn:
+            return f(*args, **kwargs, conn=conn)
 
     return with_connection_
+
+
+def with_async_connection(f):
+    async def with_async_connection_(*args, **kwargs):
+        if async_pool.closed:
+            await async_pool.open(wait=True, timeout=POOL_TIMEOUT)
+        async with async_pool.connection(timeout=POOL_TIMEOUT) as aconn:
+            return await f(*args, **kwargs, aconn=aconn)
+
+    return with_async_connection_
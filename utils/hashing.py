@@ -0,0 +1,67 @@
+import hashlib
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+
+def md5_hex_batch(arr: Iterable[bytes]) -> np.ndarray:
+    """Computes md5 hex digests for a batch of byte strings.
+
+    Args:
+        arr (Iterable[bytes]): byte strings to be hashed.
+
+    Returns:
+        np.ndarray: object array of 32-char hex digests.
+    """
+
+    if isinstance(arr, np.ndarray):
+        # plain python bytes iterate faster than boxed numpy scalars
+        arr = arr.tolist()
+    md5 = hashlib.md5
+    return np.array([md5(b).hexdigest() for b in arr], dtype=object)
+
+
+def encode_keys(values: np.ndarray) -> np.ndarray:
+    """Encodes key values into the bytes of their string form in one pass.
+
+    Integer keys are cast straight to a fixed-width bytes array (ascii digits),
+    other keys go through a vectorized utf-8 encode.
+
+    Args:
+        values (np.ndarray): key values.
+
+    Returns:
+        np.ndarray: array of byte strings, same as str(x).encode() per element.
+    """
+
+    if values.dtype.kind in "iu":
+        return values.astype(bytes)
+    return np.char.encode(values.astype(str), "utf-8")
+
+
+def md5_hex_column(column: pd.Series) -> np.ndarray:
+    """Computes md5 hex digests of a key column, hashing each distinct key once.
+
+    Args:
+        column (pd.Series): business key column.
+
+    Returns:
+        np.ndarray: object array of 32-char hex digests aligned with column.
+    """
+
+    if isinstance(column.dtype, pd.api.extensions.ExtensionDtype):
+        # nullable dtypes (e.g. Int64 with NA) would be cast to float by
+        # to_numpy(), so keep the original python values: 1 -> '1', not '1.0'
+        values = column.to_numpy(dtype=object)
+    else:
+        values = column.to_numpy()
+    codes, uniques = pd.factorize(values)
+    # factorize marks nulls with -1 and folds None into nan, so null keys
+    # are hashed from their own str() form instead of a shared unique.
+    is_null = codes == -1
+    hashes = np.empty(len(values), dtype=object)
+    hashes[~is_null] = md5_hex_batch(encode_keys(uniques))[codes[~is_null]]
+    if is_null.any():
+        hashes[is_null] = md5_hex_batch(encode_keys(values[is_null]))
+    return hashes
@@ -0,0 +1,23 @@
+import logging
+
+formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+handler = logging.StreamHandler()
+handler.setLevel(logging.DEBUG)
+handler.setFormatter(formatter)
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Returns a debug-level logger writing through the shared stream handler.
+
+    Args:
+        name (str): logger name, usually __name__ of the calling module.
+
+    Returns:
+        logging.Logger: configured logger.
+    """
+
+    logger = logging.getLogger(name)
+    logger.setLevel(logging.DEBUG)
+    if handler not in logger.handlers:
+        logger.addHandler(handler)
+    return logger